@@ -1,21 +1,44 @@
 import argparse
 import abc
+import array
+import contextlib
 from collections import Counter
-from typing import Dict, Iterator, List
-import io
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import mmap
 import multiprocessing
+import operator
 import os
-import cProfile
-import pstats
-import io 
-from functools import partial
+import queue
+import re
+import string
+import threading
 
 import psycopg2
 from psycopg2 import sql
 
 import configparser
 
+# Byte values of the lowercase ASCII letters, used as histogram slots
+ASCII_LOWERCASE = range(ord('a'), ord('z') + 1)
+
+# Byte lookup tables: ASCII uppercase folded to lowercase, every byte that is not an ASCII letter, and all ASCII bytes
+ASCII_FOLD_TABLE = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+NON_LETTER_BYTES = bytes(code for code in range(256) if code not in string.ascii_letters.encode())
+ASCII_BYTES = bytes(range(128))
+
+# Escape sequences of PostgreSQL's COPY text format and the bytes they stand for; \N (NULL) becomes
+# None to match str(None), while other non-text values keep PostgreSQL's text output format
+COPY_ESCAPES = {b'\\': b'\\', b'b': b'\b', b'f': b'\f', b'n': b'\n', b'r': b'\r', b't': b'\t', b'v': b'\v', b'N': b'None'}
+COPY_ESCAPE_PATTERN = re.compile(rb'\\(.)', re.DOTALL)
+# COPY separates columns with tabs where rows used to be joined with spaces
+COPY_DELIMITER_TABLE = bytes.maketrans(b'\t', b' ')
+# Statement terminators at the end of a query, with any whitespace and comments around them
+TRAILING_SEMICOLONS_PATTERN = re.compile(r';(?:\s|;|--[^\n]*|/\*.*?\*/)*\Z', re.DOTALL)
+
+# Per-chunk alphabet statistics: ASCII histogram indexed by byte value, Counter of non-ASCII letters,
+# and all letters seen in first-seen order (a dict used as an ordered set)
+ChunkStatistics = Tuple[array.array, Counter, Dict[str, None]]
+
 # Abstract base class for input reading
 class InputReader(abc.ABC):
     @abc.abstractmethod
@@ -23,11 +46,32 @@ class InputReader(abc.ABC):
         """Abstract method for reading input data"""
         pass
 
+# Abstract base class for input that can be split into byte ranges read independently
+class RangeInputReader(InputReader):
+    @abc.abstractmethod
+    def chunk_ranges(self) -> List[Tuple[int, int]]:
+        """Abstract method for computing the (start, end) offsets of the input chunks"""
+        pass
+
+    @abc.abstractmethod
+    def read_range(self, start: int, end: int) -> str:
+        """Abstract method for reading a single chunk of the input"""
+        pass
+
+    def read(self) -> Iterator[str]:
+        """Reads the input chunk by chunk, in order"""
+        for start, end in self.chunk_ranges():
+            yield self.read_range(start, end)
+
 # Abstract base class for output writing
 class OutputWriter(abc.ABC):
     @abc.abstractmethod
-    def write(self, sanitized_text: Iterator[str], statistics: Dict[str, int]):
-        """Abstract method for writing output data along with statistics"""
+    def write(self, sanitized_text: Iterator[str], statistics: Callable[[], Dict[str, int]]):
+        """
+        Abstract method for writing output data along with statistics.
+        The statistics are computed while sanitized_text is consumed, so statistics()
+        may only be called once sanitized_text is exhausted.
+        """
         pass
 
 # Abstract base class for text sanitization
@@ -44,106 +88,365 @@ class StatisticsCalculator(abc.ABC):
         """Abstract method for calculating statistics from the text"""
         pass
 
+# Helper function to tell whether a file is too large to stay in the page cache
+def larger_than_memory(size: int) -> bool:
+    """Returns True if size exceeds the physical memory, False if it doesn't or it can't be determined"""
+    try:
+        return size > os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return False
+
+# Helper function returning the number of worker processes of the default pool
+def workers() -> int:
+    """Returns the CPU count, which multiprocessing.Pool() uses as its size"""
+    return os.cpu_count() or 1
+
+# Helper function to size file chunks for the worker pool
+def pool_chunk_size(file_size: int, chunk_size: int) -> int:
+    """Returns chunk_size, reduced for small files so every worker still gets a few chunks"""
+    # Not so small that per-task overhead dominates
+    return min(chunk_size, max(64 * 1024, file_size // (workers() * 4)))
+
+# Helper function to split a file into chunks that each start on a UTF-8 character
+def utf8_chunk_ranges(source: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """Returns the (start, end) byte offsets of chunks of about chunk_size bytes"""
+    file_size = os.path.getsize(source)
+    if file_size == 0:
+        return []
+
+    boundaries = [0]
+    with open(source, 'rb') as file:
+        for boundary in range(chunk_size, file_size, chunk_size):
+            # Snap forward past UTF-8 continuation bytes (10xxxxxx) so that
+            # every chunk starts on a character and decodes on its own
+            file.seek(boundary)
+            for byte in file.read(3):
+                if byte & 0xC0 != 0x80:
+                    break
+                boundary += 1
+            if boundaries[-1] < boundary < file_size:
+                boundaries.append(boundary)
+    boundaries.append(file_size)
+    return list(zip(boundaries, boundaries[1:]))
+
 # File input reader using memory-mapped file for large files
-class MemoryMappedFileInputReader(InputReader):
-    def __init__(self, source: str, chunk_size: int = 1024 * 1024):  # 1 MB chunks
+class MemoryMappedFileInputReader(RangeInputReader):
+    def __init__(self, source: str, chunk_size: int = 8 * 1024 * 1024):  # 8 MB chunks
         """
         Initializes the memory-mapped file reader.
         :param source: Path to the input file
-        :param chunk_size: Size of the chunks to read from the file (default 1MB)
+        :param chunk_size: Maximum size of the chunks to read from the file (default 8MB)
         """
         self.source = source
         self.chunk_size = chunk_size
 
+    def chunk_ranges(self) -> List[Tuple[int, int]]:
+        """Splits the input file into (start, end) byte offsets of about chunk_size bytes"""
+        file_size = os.path.getsize(self.source)
+        if file_size == 0:
+            return []
+
+        ranges = utf8_chunk_ranges(self.source, pool_chunk_size(file_size, self.chunk_size))
+
+        if hasattr(os, 'posix_fadvise'):
+            # Start readahead while the pool is still starting up: the whole file if it fits
+            # in memory, otherwise the first chunk of each worker (read_range keeps it going)
+            prefetch_end = 0 if not larger_than_memory(file_size) else ranges[min(workers(), len(ranges)) - 1][1]
+            with open(self.source, 'rb') as file:
+                os.posix_fadvise(file.fileno(), 0, prefetch_end, os.POSIX_FADV_WILLNEED)
+        return ranges
+
     # Use mmap to read the file in chunks for efficient memory usage
-    def read(self) -> Iterator[str]:
-        """Reads the input file using memory-mapped IO in chunks"""
-        with open(self.source, 'r') as file:
+    def read_range(self, start: int, end: int) -> str:
+        """Reads a chunk of the input file using memory-mapped IO"""
+        with open(self.source, 'rb') as file:
+            file_size = os.fstat(file.fileno()).st_size
+            # Files that fit in memory were prefetched as a whole by chunk_ranges
+            stream = hasattr(os, 'posix_fadvise') and larger_than_memory(file_size)
+            if stream:
+                # Workers take chunks in turn, so this worker's next chunk is about one chunk
+                # per worker ahead; start its readahead now, clamped to the end of the file
+                ahead = start + workers() * (end - start)
+                if ahead < file_size:
+                    os.posix_fadvise(file.fileno(), ahead, min(end - start, file_size - ahead),
+                                     os.POSIX_FADV_WILLNEED)
             with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mmap_obj:
-                for i in range(0, len(mmap_obj), self.chunk_size):
-                    yield mmap_obj[i:i + self.chunk_size].decode('utf-8')
+                text = mmap_obj[start:end].decode('utf-8')
+            if stream:
+                # The file can't stay cached anyway, so drop the pages of the copied chunk
+                # instead of letting it evict everything else
+                os.posix_fadvise(file.fileno(), start, end - start, os.POSIX_FADV_DONTNEED)
+        return text
+
+# File input reader using one positional read per chunk instead of mmap
+class PreadFileInputReader(RangeInputReader):
+    def __init__(self, source: str, chunk_size: int = 8 * 1024 * 1024):  # 8 MB chunks
+        """
+        Initializes the positional-read file reader.
+        :param source: Path to the input file
+        :param chunk_size: Maximum size of the chunks to read from the file (default 8MB)
+        """
+        self.source = source
+        self.chunk_size = chunk_size
+
+    def chunk_ranges(self) -> List[Tuple[int, int]]:
+        """Splits the input file into (start, end) byte offsets of about chunk_size bytes"""
+        file_size = os.path.getsize(self.source)
+        return utf8_chunk_ranges(self.source, pool_chunk_size(file_size, self.chunk_size))
+
+    def read_range(self, start: int, end: int) -> str:
+        """Reads a chunk of the input file with a single positional read"""
+        with open(self.source, 'rb') as file:
+            if hasattr(os, 'pread'):
+                data = os.pread(file.fileno(), end - start, start)
+            else:
+                # Positional reads are not available on this platform, fall back to seek and read
+                file.seek(start)
+                data = file.read(end - start)
+        return data.decode('utf-8')
+
+# Helper function to make a query embeddable as a COPY subquery
+def strip_trailing_semicolons(query: str) -> str:
+    """Removes the trailing semicolons of a query, including ones followed by comments"""
+    return TRAILING_SEMICOLONS_PATTERN.sub('', query.rstrip())
+
+# Helper function to convert COPY text format rows to the text the rows were read as
+def decode_copy_text(data: bytes) -> str:
+    """Joins the columns with spaces, drops the row terminators and unescapes the values"""
+    # Raw tabs and newlines are always delimiters; tabs and newlines inside values are escaped
+    data = data.translate(COPY_DELIMITER_TABLE, b'\n')
+    if b'\\' in data:
+        data = COPY_ESCAPE_PATTERN.sub(lambda match: COPY_ESCAPES.get(match.group(1), match.group(1)), data)
+    return data.decode('utf-8')
+
+# File-like sink for copy_expert that queues COPY output in chunks of whole rows
+class CopyOutputSink:
+    def __init__(self, chunks: queue.Queue, chunk_size: int, cancelled: threading.Event):
+        """
+        Initializes the COPY output sink.
+        :param chunks: Queue receiving the decoded chunks
+        :param chunk_size: Approximate number of bytes per chunk
+        :param cancelled: Event set once the consumer stops reading
+        """
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.cancelled = cancelled
+        self.buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        """Buffers COPY output and queues it once a chunk of complete rows is available"""
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            # Cut after the last row terminator so no row or escape sequence is split
+            end = self.buffer.rfind(b'\n') + 1
+            if end:
+                self.put(decode_copy_text(self.buffer[:end]))
+                del self.buffer[:end]
+        return len(data)
+
+    def flush(self):
+        """Queues the rows left in the buffer"""
+        if self.buffer:
+            self.put(decode_copy_text(self.buffer))
+            self.buffer.clear()
+
+    def put(self, item):
+        """Queues an item, aborting the COPY if the consumer has stopped reading"""
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise InterruptedError("COPY cancelled by the reader")
 
 # Database input reader for reading data from PostgreSQL
 class DatabaseInputReader(InputReader):
-    def __init__(self, connection_params: dict, query: str):
+    def __init__(self, connection_params: dict, query: str, chunk_size: int = 1024 * 1024,
+                 queue_size: int = 4):
         """
         Initializes the database reader.
         :param connection_params: Connection parameters for PostgreSQL
         :param query: SQL query to retrieve the data
+        :param chunk_size: Approximate number of bytes per yielded chunk (default 1MB)
+        :param queue_size: Number of chunks buffered ahead of the consumer (default 4)
         """
         self.connection_params = connection_params
         self.query = query
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
 
     def read(self) -> Iterator[str]:
-        """Executes the SQL query and yields rows from the database as strings"""
+        """Streams the query result from the database as chunks of strings"""
+        # COPY runs on a background thread so database I/O overlaps with processing
+        chunks = queue.Queue(maxsize=self.queue_size)
+        cancelled = threading.Event()
+        sink = CopyOutputSink(chunks, self.chunk_size, cancelled)
+        thread = threading.Thread(target=self.copy, args=(sink,), daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    print(f"Error while connecting to PostgreSQL {item}")
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            thread.join()
+
+    def copy(self, sink: CopyOutputSink):
+        """Copies the query result into the sink, then queues an end marker or the error raised"""
+        connection = None
         try:
             connection = psycopg2.connect(**self.connection_params)
-            cursor = connection.cursor()
-            cursor.execute(self.query)
-
-            # Yield each row as a space-joined string
-            for row in cursor.fetchall():
-                yield ' '.join(map(str, row))
-
-            cursor.close()
-            connection.close()
+            connection.set_client_encoding('UTF8')
+            # COPY streams raw text rows instead of building a Python tuple per row
+            # The newline before the closing paren keeps a trailing line comment from swallowing it
+            query = sql.SQL("COPY ({}\n) TO STDOUT").format(sql.SQL(strip_trailing_semicolons(self.query)))
+            with connection.cursor() as cursor:
+                cursor.copy_expert(query, sink)
+            sink.flush()
+            sink.put(None)
         except (Exception, psycopg2.Error) as error:
-            print(f"Error while connecting to PostgreSQL {error}")
-            raise
+            if not sink.cancelled.is_set():
+                with contextlib.suppress(InterruptedError):
+                    sink.put(error)
+        finally:
+            if connection is not None:
+                connection.close()
 
 # File output writer to write sanitized text and statistics
 class FileOutputWriter(OutputWriter):
-    def __init__(self, target: str):
+    def __init__(self, target: str, buffer_size: int = 4 * 1024 * 1024):  # 4 MB buffer
         """
         Initializes the file writer.
         :param target: Path to the output file
+        :param buffer_size: Size of the output buffer (default 4MB)
         """
         self.target = target
+        self.buffer_size = buffer_size
 
-    def write(self, sanitized_text: Iterator[str], statistics: Dict[str, int]):
+    def write(self, sanitized_text: Iterator[str], statistics: Callable[[], Dict[str, int]]):
         """Writes sanitized text and alphabet count statistics to the output file"""
-        with open(self.target, 'w') as file:
+        # A large binary buffer turns many chunk writes into few write syscalls
+        with open(self.target, 'wb', buffering=self.buffer_size) as file:
             # Write each sanitized chunk of text
             for chunk in sanitized_text:
-                file.write(chunk)
-                print(chunk, end='')
+                file.write(chunk.encode('utf-8'))
 
-            # Write the calculated statistics
-            file.write('\nCount of alphabelt:\n')
-            print("\nCount of alphabelt:")
-
-            for char, count in statistics.items():
-                file.write(f'{char}: {count}\n')
-                print(f'{char}: {count}')
+            # Write the calculated statistics as a single block
+            lines = ['\nCount of alphabelt:\n']
+            lines.extend(f'{char}: {count}\n' for char, count in statistics().items())
+            file.write(''.join(lines).encode('utf-8'))
 
 # Process-based text sanitizer
 class ProcessTextSanitizer(TextSanitizer):
     def __init__(self):
-        """Initializes the sanitizer with a translation table for specific characters"""
-        self.translation_table = str.maketrans({'\t': '____'})  # Replace tabs with underscores
+        """Initializes the sanitizer with the replacement for tab characters"""
+        self.tab_replacement = '____'  # Replace tabs with underscores
 
     def sanitize(self, text: str) -> str:
         """Sanitizes the text by converting it to lowercase and replacing tabs"""
-        return text.lower().translate(self.translation_table)
+        # Most chunks have no tabs; the membership test is a single memchr-like scan
+        if '\t' not in text:
+            return text.lower()
+        # str.replace runs a C-level search for the tab, whereas translate with
+        # a multi-character mapping falls back to a per-character Python loop
+        return text.lower().replace('\t', self.tab_replacement)
 
 # Calculates the alphabet statistics for the sanitized text
 class AlphabetStatisticsCalculator(StatisticsCalculator):
     def calculate(self, text: Iterator[str]) -> Dict[str, int]:
         """Calculates and returns the count of alphabetic characters in the text"""
-        counter = Counter()
+        statistics = empty_statistics()
         for chunk in text:
-            counter.update(char for char in chunk.lower() if char.isalpha())
-        return dict(counter)
+            combine_statistics(statistics, calculate_statistics_chunk(chunk))
+        return statistics_to_dict(statistics)
+
+# Helper function to create a zeroed histogram
+def new_histogram() -> array.array:
+    """Returns a 128-slot array of 64-bit counters indexed by ASCII byte value"""
+    return array.array('q', [0]) * 128
 
-# Helper function to sanitize a chunk of text
-def sanitize_chunk(chunk: str, sanitizer: TextSanitizer) -> str:
-    """Applies the sanitization process to a chunk of text"""
-    return sanitizer.sanitize(chunk)
+# Helper function to create an empty statistics accumulator
+def empty_statistics() -> ChunkStatistics:
+    """Returns a zeroed 128-slot ASCII histogram, an empty Counter for non-ASCII letters and no letter order"""
+    return new_histogram(), Counter(), {}
 
 # Helper function to calculate statistics for a chunk of text
-def calculate_statistics_chunk(chunk: str) -> Counter:
-    """Calculates alphabet statistics for a chunk of text"""
-    return Counter(char for char in chunk.lower() if char.isalpha())
+def calculate_statistics_chunk(chunk: str) -> ChunkStatistics:
+    """
+    Calculates alphabet statistics for a chunk of text.
+    ASCII letters are counted bytewise into a histogram indexed by byte value;
+    only the non-ASCII characters of a chunk are walked one by one for the Counter.
+    """
+    counter = Counter()
+    # str.isascii() reads the string's kind flag, so the common all-ASCII case is decided in O(1)
+    if chunk.isascii():
+        data = chunk.encode('ascii')
+    else:
+        # Unicode lowercasing can map non-ASCII characters onto ASCII letters (e.g. the Kelvin sign)
+        data = chunk.lower().encode('utf-8')
+        # Deleting the ASCII bytes leaves whole multi-byte sequences, so only the
+        # non-ASCII characters are decoded and walked one by one
+        non_ascii = data.translate(None, ASCII_BYTES).decode('utf-8')
+        counter.update(char for char in non_ascii if char.isalpha())
+
+    # One pass through the 256-entry lookup tables folds A-Z onto a-z and drops every other byte
+    letters = data.translate(ASCII_FOLD_TABLE, NON_LETTER_BYTES)
+    histogram = new_histogram()
+    for code in ASCII_LOWERCASE:
+        histogram[code] = letters.count(code)
+
+    # Order the letters by first occurrence, as a Counter over the text would; letters keeps the
+    # relative order of the ASCII letters, but non-ASCII ones can only be located in data
+    search = data if counter else letters
+    positions = {chr(code): search.find(code) for code in ASCII_LOWERCASE if histogram[code]}
+    positions.update((char, data.find(char.encode('utf-8'))) for char in counter)
+    order = dict.fromkeys(sorted(positions, key=positions.get))
+    return histogram, counter, order
+
+# Helper function to merge the statistics of a chunk into an accumulator
+def combine_statistics(statistics: ChunkStatistics, stat_chunk: ChunkStatistics):
+    """Adds the chunk histogram element-wise, merges any non-ASCII counts and appends newly seen letters"""
+    histogram, counter, order = statistics
+    chunk_histogram, chunk_counter, chunk_order = stat_chunk
+    histogram[:] = array.array('q', map(operator.add, histogram, chunk_histogram))
+    if chunk_counter:
+        counter.update(chunk_counter)
+    # dict.update keeps the position of letters already seen in earlier chunks
+    order.update(chunk_order)
+
+# Helper function to convert accumulated statistics to the output mapping
+def statistics_to_dict(statistics: ChunkStatistics) -> Dict[str, int]:
+    """Returns the counts of all letters seen, in the order they were first seen"""
+    histogram, counter, order = statistics
+    return {char: histogram[ord(char)] if char.isascii() else counter[char] for char in order}
+
+# Worker process state, installed once per worker by init_worker instead of pickled with every task
+_worker_sanitizer = None
+_worker_input_reader = None
+
+# Pool initializer storing the sanitizer and input reader in the worker process
+def init_worker(sanitizer: TextSanitizer, input_reader: Optional[RangeInputReader]):
+    """Stores the objects shared by all tasks of a worker in module globals"""
+    global _worker_sanitizer, _worker_input_reader
+    _worker_sanitizer = sanitizer
+    _worker_input_reader = input_reader
+
+# Helper function to sanitize a chunk of text and count its alphabet in one pass
+def process_chunk(chunk: str) -> Tuple[str, ChunkStatistics]:
+    """Sanitizes a chunk of text and returns it together with its alphabet statistics"""
+    sanitized = _worker_sanitizer.sanitize(chunk)
+    return sanitized, calculate_statistics_chunk(sanitized)
+
+# Helper function to read, sanitize and count a chunk of a range reader inside the worker
+def process_range(chunk_range: Tuple[int, int]) -> Tuple[str, ChunkStatistics]:
+    """Reads the chunk between the given offsets and processes it like process_chunk"""
+    return process_chunk(_worker_input_reader.read_range(*chunk_range))
 
 # Main text processor that coordinates reading, sanitizing, and writing
 class TextProcessor:
@@ -163,27 +466,41 @@ class TextProcessor:
 
     def process(self):
         """Processes the input by sanitizing text and calculating statistics, then writes the results"""
-        input_text = self.input_reader.read()
-
-        # Multiprocessing for sanitizing text chunks
-        with multiprocessing.Pool() as pool:
-            sanitized_chunks = pool.imap(
-                partial(sanitize_chunk, sanitizer=self.sanitizer),
-                input_text,
-                chunksize=10
-            )
-            # Calculate statistics in parallel
-            statistics_chunks = pool.imap(calculate_statistics_chunk, sanitized_chunks, chunksize=10)
-
-            # Combine statistics from all chunks
-            combined_statistics = Counter()
-            for stat_chunk in statistics_chunks:
-                combined_statistics.update(stat_chunk)
-
-        # Re-read input for output writing (or store sanitized data temporarily)
-        input_text = self.input_reader.read()
-        sanitized_iterator = (self.sanitizer.sanitize(chunk) for chunk in input_text)
-        self.output_writer.write(sanitized_iterator, dict(combined_statistics))
+        statistics = empty_statistics()
+        exhausted = False
+
+        # Range readers let workers read their own chunks, so only offsets are sent to the pool
+        if isinstance(self.input_reader, RangeInputReader):
+            tasks = self.input_reader.chunk_ranges()
+            worker = process_range
+            worker_input_reader = self.input_reader
+        else:
+            tasks = self.input_reader.read()
+            worker = process_chunk
+            worker_input_reader = None
+
+        # Multiprocessing for sanitizing and counting text chunks in a single pass;
+        # imap (not imap_unordered) keeps the sanitized output in input order
+        with multiprocessing.Pool(initializer=init_worker,
+                                  initargs=(self.sanitizer, worker_input_reader)) as pool:
+            # Chunks are already large, so send them one per task for better load balance
+            processed_chunks = pool.imap(worker, tasks, chunksize=1)
+
+            # Stream sanitized chunks to the writer while combining their statistics
+            def sanitized_iterator():
+                nonlocal exhausted
+                for sanitized, stat_chunk in processed_chunks:
+                    combine_statistics(statistics, stat_chunk)
+                    yield sanitized
+                exhausted = True
+
+            # Statistics are complete only after the last chunk, so refuse to hand out partial counts
+            def final_statistics() -> Dict[str, int]:
+                if not exhausted:
+                    raise RuntimeError("Statistics are only available once the sanitized text is exhausted")
+                return statistics_to_dict(statistics)
+
+            self.output_writer.write(sanitized_iterator(), final_statistics)
 
 # Main function for parsing arguments and running the text processor
 def main():
@@ -194,9 +511,11 @@ def main():
     parser = argparse.ArgumentParser(description="Text Sanitizer Application")
     parser.add_argument("--source", help="Source type (file or db)", required=False)
     parser.add_argument("--input", help="Input file path (required if source is 'file')", required=False)
+    parser.add_argument("--reader", help="File reader (mmap or pread)", default="mmap")
     parser.add_argument("--target", help="Target file path", required=False)
     parser.add_argument("--query", help='SQL query reading from database', default=None)
     parser.add_argument("--config", help="Path to the config file", default=None)
+    parser.add_argument("--profile", help="Profile the main process and print the slowest calls", action="store_true")
     args = parser.parse_args()
 
     # Read config file if provided, fallback to command-line args if missing
@@ -207,6 +526,7 @@ def main():
         config.read(args.config)
         source = config.get('settings', 'source', fallback=args.source)
         input_file = config.get('settings', 'input', fallback=args.input)
+        reader = config.get('settings', 'reader', fallback=args.reader)
         target = config.get('settings', 'target', fallback=args.target)
         query = config.get('settings', 'query', fallback=args.query)
 
@@ -222,12 +542,17 @@ def main():
     else:
         source = args.source
         input_file = args.input
+        reader = args.reader
         target = args.target
         query = args.query
 
     # Choose the appropriate input reader based on the source type
-    if source == "file":
+    if source == "file" and reader == "mmap":
         input_reader = MemoryMappedFileInputReader(input_file)
+    elif source == "file" and reader == "pread":
+        input_reader = PreadFileInputReader(input_file)
+    elif source == "file":
+        raise ValueError("Reader must be either 'mmap' or 'pread'")
     elif source == "db":
         input_reader = DatabaseInputReader(connection_params, query)
     else:
@@ -240,7 +565,16 @@ def main():
 
     # Process the text
     processor = TextProcessor(input_reader, output_writer, sanitizer, statistics_calculator)
-    processor.process()
+    if args.profile:
+        # Profiling modules are only imported when requested to keep startup lean
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.runcall(processor.process)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
+    else:
+        processor.process()
 
 if __name__ == "__main__":
     main()